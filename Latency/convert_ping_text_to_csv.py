@@ -1,44 +1,198 @@
 import csv
-from datetime import datetime
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import chain
+
+import pandas as pd
+
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+TS_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+SECOND_FORMAT = "%Y-%m-%d %H:%M:%S"
+# TS_FORMAT with every field at full width, hours 00-23 and seconds 00-59
+CANONICAL_TS = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2} ([01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9]\.[0-9]{6}")
+ONE_US = timedelta(microseconds=1)
+PARSE_ERRORS = (ValueError,) if pl is None else (ValueError, pl.exceptions.PolarsError)
+
 
 def convert_to_csv(input_txt: str, output_csv: str):
-    timestamps = []
-    rtts = []
+    try:
+        # polars parses and writes with all cores, so prefer it for large logs when installed
+        if pl is not None:
+            written = _convert_polars(input_txt, output_csv)
+        else:
+            written = _convert_pandas(input_txt, output_csv)
+    except PARSE_ERRORS:
+        # Malformed input: fall back to the line-by-line parser, which skips bad lines
+        _convert_rows(input_txt, output_csv)
+        return
 
-    with open(input_txt, 'r') as infile:
-        lines = infile.readlines()
-
-        # Skip the first header line
-        for line in lines[1:]:
-            if not line.strip():
-                continue
-            try:
-                ts_str, rtt_str = line.strip().split(',')
-                ts = datetime.strptime(ts_str.strip(), "%Y-%m-%d %H:%M:%S.%f")
-                rtt = float(rtt_str.strip())
-                timestamps.append(ts)
-                rtts.append(rtt)
-            except Exception as e:
-                print(f"Skipping line due to error: {line.strip()} ({e})")
-
-    if not timestamps:
+    if not written:
         print("No valid data found.")
         return
 
-    base_time = timestamps[0]
+    print(f"Converted data written to {output_csv}")
+
+
+def _convert_polars(input_txt: str, output_csv: str) -> bool:
+    # Skip the first header line and read every column as text. Quotes are plain text,
+    # as they are for the line-by-line parser.
+    df = pl.read_csv(input_txt, has_header=False, skip_rows=1, new_columns=["timestamp", "rtt"],
+                     infer_schema_length=0, quote_char=None)
+    df = df.filter(pl.any_horizontal(pl.all().is_not_null())).select(pl.all().str.strip_chars())
+    if df.null_count().sum_horizontal().item():
+        raise ValueError("missing fields")
+    if df.is_empty():
+        return False
+
+    # chrono's %.f is looser than strptime (no fraction, nine digits, :60), so only the
+    # canonical form is parsed here; anything else goes to the line-by-line parser
+    if not df["timestamp"].str.contains(f"^{CANONICAL_TS.pattern}$").all():
+        raise ValueError("non-canonical timestamp")
+    # Build the columns in stages so each one is computed once
+    df = df.with_columns(us=pl.col("timestamp").str.strptime(pl.Datetime("us"), "%Y-%m-%d %H:%M:%S%.f"),
+                         rtt_value=pl.col("rtt").cast(pl.Float64))
+    df = df.with_columns(us=(pl.col("us") - pl.col("us").first()).dt.total_microseconds())
+    # Same rounding as _format_relative; the rows it hands to the float are patched below
+    df = df.with_columns(ms=pl.col("us") // 1000 + (pl.col("us") % 1000 > 500).cast(pl.Int64))
+    df = df.select(
+        # Canonical text trimmed from microseconds to milliseconds
+        pl.col("timestamp").str.slice(0, 23),
+        pl.col("us"),
+        pl.col("rtt_value"),
+        relative=pl.concat_str([(pl.col("ms") // 1000).cast(pl.Utf8), pl.lit("."),
+                                (pl.col("ms") % 1000).cast(pl.Utf8).str.zfill(3)]),
+        rtt=pl.col("rtt_value").cast(pl.Utf8),
+    )
+
+    # Exact half milliseconds and negative offsets round like the float, and Python
+    # spells tiny, huge and non-finite floats differently; format those few rows in Python
+    us = df["us"]
+    odd = ((us < 0) | (us % 1000 == 500)).arg_true()
+    relative = df["relative"].scatter(odd, [f"{v / 1e6:.3f}" for v in us.gather(odd)])
+    rtt = df["rtt_value"]
+    odd = (~((rtt.abs() >= 1e-4) & (rtt.abs() < 1e16))).arg_true()
+    rtt_text = df["rtt"].scatter(odd, [repr(v) for v in rtt.gather(odd)])
+
+    pl.DataFrame([df["timestamp"], relative, rtt_text]).write_csv(output_csv, line_terminator="\r\n")
+    return True
+
+
+def _convert_pandas(input_txt: str, output_csv: str) -> bool:
+    df = _load_vectorized(input_txt)
+    if df.empty:
+        return False
+
+    out = pd.DataFrame({
+        "timestamp": df["timestamp"].dt.strftime(TS_FORMAT).str[:-3],
+        "relative": (df["timestamp"] - df["timestamp"].iloc[0]).dt.total_seconds(),
+        "rtt": df["rtt"].astype(str),
+    })
+    out.to_csv(output_csv, index=False, float_format="%.3f", lineterminator="\r\n")
+    return True
+
+
+def _load_vectorized(input_txt: str) -> pd.DataFrame:
+    # Skip the first header line; raises ValueError on any line that does not parse.
+    # Quotes are plain text here, as they are for the line-by-line parser.
+    df = pd.read_csv(input_txt, names=["timestamp", "rtt"], skiprows=1, header=None,
+                     skipinitialspace=True, quoting=csv.QUOTE_NONE, dtype=str)
+    if df.isna().any().any():
+        raise ValueError("missing fields")
+    ts = df["timestamp"].str.strip()
+    # pandas' parser is looser than strptime (nine-digit fractions, :60 rolls over),
+    # so only the canonical form is parsed here; anything else goes to the fallback
+    if not ts.str.fullmatch(CANONICAL_TS.pattern).all():
+        raise ValueError("non-canonical timestamp")
+    df["timestamp"] = pd.to_datetime(ts, format=TS_FORMAT, cache=True)
+    # astype(float) goes through float() for text, so values round-trip like the fallback
+    df["rtt"] = df["rtt"].str.strip().astype(float)
+    return df
+
+
+def _parse_timestamp(ts_str: str) -> datetime:
+    # ciso8601 accepts much more than TS_FORMAT (dates, 'T', zones, 24:00), so only
+    # hand it the canonical form and let strptime judge everything else
+    if ciso8601 is not None and CANONICAL_TS.fullmatch(ts_str):
+        try:
+            ts = ciso8601.parse_datetime(ts_str)
+        except ValueError:
+            pass
+        else:
+            if ts.tzinfo is None:
+                return ts
+    # Consecutive pings usually share a whole second, so only the prefix goes through strptime
+    prefix, _, frac = ts_str.rpartition('.')
+    # %f only takes one to six ASCII digits; str.isdigit() alone would allow other scripts
+    if not prefix or not (frac.isascii() and frac.isdigit()) or len(frac) > 6:
+        raise ValueError(f"time data '{ts_str}' does not match format '{TS_FORMAT}'")
+    return _parse_second(prefix) + timedelta(microseconds=int(frac.ljust(6, '0')))
+
+
+@lru_cache(maxsize=4096)
+def _parse_second(prefix: str) -> datetime:
+    return datetime.strptime(prefix, SECOND_FORMAT)
+
+
+def _read_rows(infile):
+    # Skip the first header line
+    next(infile, None)
+    for line in infile:
+        if not line.strip():
+            continue
+        try:
+            ts_str, rtt_str = line.strip().split(',')
+            ts_str = ts_str.strip()
+            ts = _parse_timestamp(ts_str)
+            rtt = float(rtt_str.strip())
+        except Exception as e:
+            print(f"Skipping line due to error: {line.strip()} ({e})")
+            continue
+        yield ts_str, ts, rtt
+
+
+def _format_relative(delta: timedelta) -> str:
+    ms, rem = divmod(delta // ONE_US, 1000)
+    if ms < 0 or rem == 500:
+        # Negative offsets and exact half milliseconds round like f"{seconds:.3f}"
+        # only when formatted from the float itself
+        return f"{delta.total_seconds():.3f}"
+    if rem > 500:
+        ms += 1
+    sec, ms = divmod(ms, 1000)
+    return f"{sec}.{ms:03d}"
+
+
+def _convert_rows(input_txt: str, output_csv: str):
+    with open(input_txt, 'r') as infile:
+        rows = _read_rows(infile)
+        first = next(rows, None)
+        if first is None:
+            print("No valid data found.")
+            return
+
+        base_time = first[1]
 
-    with open(output_csv, 'w', newline='') as outfile:
-        writer = csv.DictWriter(outfile, fieldnames=["timestamp", "relative", "rtt"])
-        writer.writeheader()
-        for ts, rtt in zip(timestamps, rtts):
-            relative_sec = (ts - base_time).total_seconds()
-            writer.writerow({
-                "timestamp": ts.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
-                "relative": f"{relative_sec:.3f}",
-                "rtt": rtt
-            })
+        with open(output_csv, 'w', newline='') as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(["timestamp", "relative", "rtt"])
+            for ts_str, ts, rtt in chain([first], rows):
+                # Reuse the input text when it is already in canonical microsecond form
+                if not CANONICAL_TS.fullmatch(ts_str):
+                    ts_str = ts.strftime(TS_FORMAT)
+                writer.writerow([ts_str[:-3], _format_relative(ts - base_time), rtt])
 
     print(f"Converted data written to {output_csv}")
 
-# Example usage:
-convert_to_csv("ping_sample.txt", "ping_sample.csv")
+if __name__ == "__main__":
+    # Example usage:
+    convert_to_csv("ping_sample.txt", "ping_sample.csv")
@@ -0,0 +1,140 @@
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Latency"))
+
+import convert_ping_text_to_csv as conv  # noqa: E402
+
+HEADER = "timestamp,rtt\n"
+
+ROWS = """2025-03-01 23:59:59.999000, 12.5
+2025-03-01 23:59:59.999500, 1e-05
+2025-03-02 00:00:00.001500, 0.30000000000000004
+2025-03-02 00:00:00.002000,74
+2025-03-02 00:00:00.003500, 3.25
+2025-03-02 00:00:01.123456, inf
+2025-03-02 00:00:01.124456 , 33.0
+2025-03-02 00:00:01.200000, 1e+16
+2025-03-02 00:00:01.300000, -0
+"""
+
+WELL_FORMED = HEADER + ROWS
+
+# Lines the baseline strptime/float() parser skipped
+MALFORMED_LINES = [
+    "2025-03-02 00:00:02, 1.0",
+    "2025-03-02 00:00:02.123456789, 1.0",
+    "2025-03-02 00:00:02.123456Z, 1.0",
+    "2025-03-02T00:00:02.123456, 1.0",
+    "2025-03-02 00:00:60.000000, 1.0",
+    "2025-03-02 24:00:00.000000, 1.0",
+    "2025-03-02, 1.0",
+    '"2025-03-02 00:00:02.100000", 1.5',
+    '2025-03-02 00:00:02.100000,"12.5"',
+    "2025-03-02 00:00:02.100000, True",
+    "2025-03-02 00:00:02.\u0661\u0662, 1.0",
+    "2025-03-02 00:00:02., 1.0",
+]
+
+
+@pytest.fixture(params=["ciso8601", "strptime"], autouse=True)
+def parser(request, monkeypatch):
+    # Run every test with and without ciso8601 so the strptime route stays covered
+    if request.param == "ciso8601":
+        pytest.importorskip("ciso8601")
+    else:
+        monkeypatch.setattr(conv, "ciso8601", None)
+    return request.param
+
+
+def _paths():
+    paths = [conv._convert_rows, conv._convert_pandas]
+    if conv.pl is not None:
+        paths.append(conv._convert_polars)
+    return paths
+
+
+def _run(convert, tmp_path, text):
+    src = tmp_path / "ping.txt"
+    src.write_text(text)
+    out = tmp_path / f"{convert.__name__}.csv"
+    out.unlink(missing_ok=True)
+    convert(str(src), str(out))
+    return out.read_bytes() if out.exists() else None
+
+
+def test_paths_write_identical_output(tmp_path):
+    outputs = {convert.__name__: _run(convert, tmp_path, WELL_FORMED) for convert in _paths()}
+    assert len(set(outputs.values())) == 1, outputs
+
+
+@pytest.mark.parametrize("polars", ["installed", "missing"])
+def test_convert_to_csv_matches_fallback(tmp_path, monkeypatch, polars):
+    if polars == "installed":
+        pytest.importorskip("polars")
+    else:
+        monkeypatch.setattr(conv, "pl", None)
+    expected = _run(conv._convert_rows, tmp_path, WELL_FORMED)
+    assert _run(conv.convert_to_csv, tmp_path, WELL_FORMED) == expected
+
+
+def test_nan_rtt_is_written_like_fallback(tmp_path):
+    text = WELL_FORMED + "2025-03-02 00:00:02.000000, nan\n"
+    expected = _run(conv._convert_rows, tmp_path, text)
+    assert expected.decode().splitlines()[-1].endswith(",nan")
+    assert _run(conv.convert_to_csv, tmp_path, text) == expected
+    if conv.pl is not None:
+        assert _run(conv._convert_polars, tmp_path, text) == expected
+
+
+def test_short_fraction_is_padded_like_strptime(tmp_path):
+    text = WELL_FORMED + "2025-03-02 00:00:02.5, 1.0\n"
+    rows = _run(conv.convert_to_csv, tmp_path, text).decode().splitlines()
+    assert rows[-1] == "2025-03-02 00:00:02.500,2.501,1.0"
+
+
+def test_relative_matches_float_seconds_format(tmp_path):
+    rows = _run(conv._convert_rows, tmp_path, WELL_FORMED).decode().splitlines()
+    assert rows[0] == "timestamp,relative,rtt"
+    # Exact half milliseconds follow f"{seconds:.3f}": these round up...
+    assert rows[2] == "2025-03-01 23:59:59.999,0.001,1e-05"
+    assert rows[3] == "2025-03-02 00:00:00.001,0.003,0.30000000000000004"
+    # ...and this one rounds down, because 0.0045 is stored just below the half
+    assert rows[5] == "2025-03-02 00:00:00.003,0.004,3.25"
+
+
+def test_format_relative_matches_float_format():
+    for us in [*range(-3000, 20000), 86_399_999_500, 123_456_789_012]:
+        delta = timedelta(microseconds=us)
+        assert conv._format_relative(delta) == f"{delta.total_seconds():.3f}", us
+
+
+@pytest.mark.parametrize("line", MALFORMED_LINES)
+def test_malformed_line_is_skipped_on_every_path(tmp_path, line):
+    text = WELL_FORMED + line + "\n"
+    for convert in _paths()[1:]:
+        with pytest.raises(conv.PARSE_ERRORS):
+            _run(convert, tmp_path, text)
+
+    expected = _run(conv._convert_rows, tmp_path, text)
+    assert expected == _run(conv._convert_rows, tmp_path, WELL_FORMED)
+    assert _run(conv.convert_to_csv, tmp_path, text) == expected
+
+
+def test_stray_quote_in_header_is_ignored(tmp_path):
+    text = '"PING 8.8.8.8, x\n' + ROWS
+    expected = _run(conv._convert_rows, tmp_path, WELL_FORMED)
+    for convert in _paths():
+        assert _run(convert, tmp_path, text) == expected
+    assert _run(conv.convert_to_csv, tmp_path, text) == expected
+
+
+def test_boolean_rtt_column_is_rejected(tmp_path):
+    text = HEADER + "2025-03-02 00:00:00.001500, True\n2025-03-02 00:00:00.002000, False\n"
+    for convert in _paths()[1:]:
+        with pytest.raises(conv.PARSE_ERRORS):
+            _run(convert, tmp_path, text)
+    assert _run(conv.convert_to_csv, tmp_path, text) is None